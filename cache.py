@@ -0,0 +1,226 @@
+import aiohttp
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from functools import lru_cache
+import numpy as np
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from db import ReadSession, WriteSession
+from models import CachedAnalysis, ExactAnalysisCache
+
+# Local Ollama embedding endpoint used for the semantic cache
+OLLAMA_URL = os.getenv('OLLAMA_URL', 'http://localhost:11434')
+EMBEDDING_MODEL = 'nomic-embed-text'
+
+# The semantic cache is best-effort, so a slow embedding service must not
+# hold up the DeepSeek call behind it
+EMBEDDING_TIMEOUT = aiohttp.ClientTimeout(total=5)
+
+# Cleared after the first embedding failure so the rest of the run skips
+# the semantic cache instead of retrying (and warning) for every article
+_semantic_cache_enabled = True
+
+# Only the start of the article is embedded; it is enough to spot reposts
+EMBEDDING_CHARS = 2048
+
+# Minimum cosine similarity for a cached analysis to be reused
+SIMILARITY_THRESHOLD = 0.92
+
+# Cached analyses older than this are ignored so CEO names don't go stale
+CACHE_TTL = timedelta(days=30)
+
+def exact_key(model, temperature, body_text):
+    """
+    Build the exact-match cache key for an analysis request. The model and
+    temperature are part of the key so a model upgrade never serves old
+    responses.
+    """
+    return hashlib.sha256(f"{model}\n{temperature}\n{body_text}".encode()).hexdigest()
+
+@lru_cache(maxsize=1024)
+def _cached(key):
+    """
+    Fetch the JSON-encoded analysis stored under the given key. Raises
+    KeyError on a miss, which lru_cache does not memoize.
+    """
+    session = ReadSession()
+    try:
+        row = session.get(ExactAnalysisCache, key)
+    finally:
+        session.close()
+    if row is None:
+        raise KeyError(key)
+    return row.analysis
+
+def get_exact_analysis(key):
+    """
+    Return the cached analysis for an identical earlier request, or None.
+    """
+    try:
+        return json.loads(_cached(key))
+    except KeyError:
+        return None
+
+def store_exact_analysis(key, analysis):
+    """
+    Store an analysis under its exact-match key, keeping any existing entry.
+    """
+    session = WriteSession()
+    try:
+        session.execute(
+            insert(ExactAnalysisCache).prefix_with("OR IGNORE").values(hash=key, analysis=json.dumps(analysis))
+        )
+        session.commit()
+    except SQLAlchemyError as e:
+        logging.error("Failed to cache analysis: %s", e)
+        session.rollback()
+    finally:
+        session.close()
+
+async def embed_text(http_session, text):
+    """
+    Embed the start of the given text with the local embedding model.
+    Returns a unit-length float32 vector, or None if the embedding service
+    is unavailable so the caller can fall back to an uncached analysis.
+    The first failure disables the semantic cache for the rest of the run.
+    """
+    global _semantic_cache_enabled
+    if not _semantic_cache_enabled:
+        return None
+
+    data = {
+        "model": EMBEDDING_MODEL,
+        "prompt": text[:EMBEDDING_CHARS]
+    }
+    try:
+        async with http_session.post(f"{OLLAMA_URL}/api/embeddings", json=data, timeout=EMBEDDING_TIMEOUT) as response:
+            response.raise_for_status()
+            result = await response.json()
+        vector = np.asarray(result["embedding"], dtype=np.float32)
+    except (aiohttp.ClientError, asyncio.TimeoutError, KeyError, TypeError, ValueError) as e:
+        if _semantic_cache_enabled:
+            _semantic_cache_enabled = False
+            logging.warning("Embedding service unavailable, semantic cache disabled for this run: %r", e)
+        return None
+
+    norm = np.linalg.norm(vector)
+    if not norm:
+        return None
+    return vector / norm
+
+def quantize(vector):
+    """
+    Quantize a float vector to int8 with a single per-vector scale, so that
+    vector is approximately values * scale. Returns (values, scale). Stored
+    embeddings take a quarter of the space of float32 ones.
+    """
+    scale = float(np.abs(vector).max()) / 127 or 1.0
+    return np.round(vector / scale).astype(np.int8), scale
+
+# Dequantized float32 embeddings per domain, kept between lookups and
+# topped up with rows added since, so each lookup is one BLAS matmul
+_indexes = {}
+
+def _load_index(domain, dim, cutoff):
+    """
+    Return the in-memory index for a domain after loading any cache rows
+    stored since the last call and dropping entries older than cutoff.
+    The index holds row ids, creation times and a float32 matrix.
+    """
+    index = _indexes.get(domain)
+    if index is None or index["matrix"].shape[1] != dim:
+        index = {
+            "last_id": 0,
+            "ids": np.empty(0, dtype=np.int64),
+            "created": np.empty(0, dtype=np.float64),
+            "matrix": np.empty((0, dim), dtype=np.float32)
+        }
+        _indexes[domain] = index
+
+    session = ReadSession()
+    try:
+        rows = session.query(CachedAnalysis.id, CachedAnalysis.embedding, CachedAnalysis.scale, CachedAnalysis.created_at).filter(
+            CachedAnalysis.domain == domain,
+            CachedAnalysis.id > index["last_id"],
+            CachedAnalysis.created_at >= cutoff
+        ).order_by(CachedAnalysis.id).all()
+    finally:
+        session.close()
+
+    if rows:
+        index["last_id"] = rows[-1].id
+        # Skip vectors from a different embedding model
+        rows = [row for row in rows if len(row.embedding) == dim]
+    if rows:
+        values = np.frombuffer(b''.join(row.embedding for row in rows), dtype=np.int8).reshape(len(rows), dim)
+        scales = np.array([row.scale for row in rows], dtype=np.float32)
+        index["ids"] = np.concatenate([index["ids"], [row.id for row in rows]])
+        index["created"] = np.concatenate([index["created"], [row.created_at.timestamp() for row in rows]])
+        index["matrix"] = np.concatenate([index["matrix"], values.astype(np.float32) * scales[:, None]])
+
+    # Forget entries that have passed their TTL
+    fresh = index["created"] >= cutoff.timestamp()
+    if not fresh.all():
+        index["ids"] = index["ids"][fresh]
+        index["created"] = index["created"][fresh]
+        index["matrix"] = index["matrix"][fresh]
+    return index
+
+def find_similar_analysis(embedding, domain):
+    """
+    Look up the cached analysis from the same domain whose embedding is
+    closest to the given one. Returns the analysis dictionary if its cosine
+    similarity clears SIMILARITY_THRESHOLD, otherwise None. Any failure is
+    treated as a miss so the article still goes to DeepSeek.
+    """
+    try:
+        return _find_similar_analysis(embedding, domain)
+    except Exception as e:
+        logging.error("Semantic cache lookup failed, treating it as a miss: %s", e)
+        return None
+
+def _find_similar_analysis(embedding, domain):
+    index = _load_index(domain, embedding.shape[0], datetime.utcnow() - CACHE_TTL)
+    if not len(index["ids"]):
+        return None
+
+    # Both vectors are unit-length, so the dot product is the cosine
+    similarities = index["matrix"] @ embedding
+    best = int(np.argmax(similarities))
+    if similarities[best] <= SIMILARITY_THRESHOLD:
+        return None
+
+    session = ReadSession()
+    try:
+        row = session.get(CachedAnalysis, int(index["ids"][best]))
+    finally:
+        session.close()
+    if row is None:
+        return None
+
+    logging.info("Semantic cache hit (similarity %.3f).", similarities[best])
+    return json.loads(row.analysis)
+
+def store_analysis(embedding, domain, analysis):
+    """
+    Store a fresh analysis in the semantic cache under its quantized embedding.
+    """
+    values, scale = quantize(embedding)
+    session = WriteSession()
+    try:
+        session.add(CachedAnalysis(
+            domain=domain,
+            embedding=values.tobytes(),
+            scale=scale,
+            analysis=json.dumps(analysis)
+        ))
+        session.commit()
+    except SQLAlchemyError as e:
+        logging.error("Failed to cache analysis: %s", e)
+        session.rollback()
+    finally:
+        session.close()
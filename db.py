@@ -0,0 +1,102 @@
+import os
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+from models import Base, CachedAnalysis
+
+# Define the SQLite database filename
+db_filename = 'bottom_feeder.db'
+DATABASE_URL = f'sqlite:///{db_filename}'
+
+# Bump whenever the models change so existing databases pick up new tables
+SCHEMA_VERSION = 2
+
+def _on_connect(dbapi_conn, connection_record):
+    """
+    Configure every new SQLite connection for concurrent scraping: WAL lets
+    readers and the writer proceed together, and NORMAL synchronous avoids
+    an fsync on every commit.
+    """
+    # Let SQLAlchemy issue BEGIN itself instead of pysqlite's deferred BEGIN
+    dbapi_conn.isolation_level = None
+    dbapi_conn.execute("PRAGMA journal_mode=WAL")
+    dbapi_conn.execute("PRAGMA synchronous=NORMAL")
+    dbapi_conn.execute("PRAGMA busy_timeout=5000")
+    dbapi_conn.execute("PRAGMA cache_size=-20000")
+    dbapi_conn.execute("PRAGMA temp_store=MEMORY")
+    dbapi_conn.execute("PRAGMA foreign_keys=ON")
+
+def _on_connect_read_only(dbapi_conn, connection_record):
+    """
+    Make reader connections refuse writes, so only the writer pool ever
+    takes SQLite's write lock.
+    """
+    dbapi_conn.execute("PRAGMA query_only=1")
+
+def _on_begin(conn):
+    """
+    Take the write lock up front so concurrent writers wait on busy_timeout
+    instead of failing with SQLITE_BUSY when upgrading a read transaction.
+    """
+    conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+def _on_begin_read_only(conn):
+    """
+    Start a deferred transaction so reads see one consistent WAL snapshot
+    without locking out the writer.
+    """
+    conn.exec_driver_sql("BEGIN")
+
+def create_db_engine(url=DATABASE_URL, read_only=False, **kwargs):
+    """
+    Create an SQLAlchemy engine whose connections all share the same PRAGMAs.
+    Read-only engines reject writes and never take the write lock.
+    In-memory databases are left with the SQLite defaults. No connection is
+    opened until the engine is first used.
+    """
+    kwargs.setdefault('query_cache_size', 1200)
+    engine = create_engine(url, **kwargs)
+    if not url.endswith(':memory:'):
+        event.listen(engine, "connect", _on_connect)
+        if read_only:
+            event.listen(engine, "connect", _on_connect_read_only)
+            event.listen(engine, "begin", _on_begin_read_only)
+        else:
+            event.listen(engine, "begin", _on_begin)
+    return engine
+
+# SQLite allows a single writer, so writes share one pooled connection
+writer_engine = create_db_engine(poolclass=QueuePool, pool_size=1, max_overflow=0)
+
+# WAL lets any number of readers run alongside the writer
+reader_engine = create_db_engine(read_only=True, poolclass=QueuePool, pool_size=os.cpu_count() or 1)
+
+# Create configured "Session" classes for each pool. Objects stay loaded
+# after commit so reading their IDs doesn't trigger another SELECT.
+ReadSession = sessionmaker(bind=reader_engine, expire_on_commit=False)
+WriteSession = sessionmaker(bind=writer_engine, expire_on_commit=False)
+
+def create_schema(engine=writer_engine):
+    """
+    Create all tables and record the schema version in PRAGMA user_version.
+    """
+    with engine.begin() as conn:
+        version = conn.exec_driver_sql("PRAGMA user_version").scalar()
+        # Version 2 quantized the semantic cache to int8; older float32
+        # entries are just a cache, so they are dropped rather than converted
+        if version < 2:
+            CachedAnalysis.__table__.drop(conn, checkfirst=True)
+        Base.metadata.create_all(conn)
+        conn.exec_driver_sql(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+def ensure_schema():
+    """
+    Create the tables only if the database is older than SCHEMA_VERSION,
+    so the steady state costs a single PRAGMA read instead of a full
+    create_all. The version is read through the reader pool, so an
+    up-to-date database never takes the write lock.
+    """
+    with reader_engine.connect() as conn:
+        version = conn.exec_driver_sql("PRAGMA user_version").scalar()
+    if version < SCHEMA_VERSION:
+        create_schema(writer_engine)
@@ -1,14 +1,9 @@
-from sqlalchemy import create_engine
-from models import Base
-import os
-
-# Define the SQLite database filename
-db_filename = 'bottom_feeder.db'
+from db import create_db_engine, create_schema, db_filename
 
 # Create the SQLite engine
-engine = create_engine(f'sqlite:///{db_filename}', echo=True)
+engine = create_db_engine(echo=False)
 
 # Create all tables in the database
-Base.metadata.create_all(engine)
+create_schema(engine)
 
 print(f"Database '{db_filename}' and tables created successfully.")
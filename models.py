@@ -1,5 +1,6 @@
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy import Column, Integer, String, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, LargeBinary, DateTime, Float
+from datetime import datetime
 from sqlalchemy.orm import relationship
 
 Base = declarative_base()
@@ -7,7 +8,7 @@ Base = declarative_base()
 class Article(Base):
     __tablename__ = 'articles'
     id = Column(Integer, primary_key=True)
-    url = Column(String, unique=True, nullable=False)
+    url = Column(String, unique=True, index=True, nullable=False)
     title = Column(String, nullable=False)
     publication_date = Column(String, nullable=False)  # Using String for simplicity
     body_text = Column(Text, nullable=False)
@@ -21,3 +22,17 @@ class AnalysisResult(Base):
     ceo_name = Column(String)
     summary = Column(Text)
     article = relationship("Article", back_populates="analysis")
+
+class CachedAnalysis(Base):
+    __tablename__ = 'cached_analyses'
+    id = Column(Integer, primary_key=True)
+    domain = Column(String, nullable=False, index=True)  # Source domain the analysis was made for
+    embedding = Column(LargeBinary, nullable=False)  # int8-quantized unit-length vector
+    scale = Column(Float, nullable=False)  # Multiplier that maps the int8 values back to floats
+    analysis = Column(Text, nullable=False)  # JSON-encoded analysis
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+class ExactAnalysisCache(Base):
+    __tablename__ = 'analysis_cache'
+    hash = Column(String, primary_key=True)  # SHA-256 of model, temperature and body text
+    analysis = Column(Text, nullable=False)  # JSON-encoded analysis
@@ -1,35 +1,28 @@
-import requests
-from bs4 import BeautifulSoup
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from models import Article, AnalysisResult, Base
+import aiohttp
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from bs4 import BeautifulSoup, SoupStrainer
+from db import ReadSession, WriteSession, ensure_schema
+from models import Article, AnalysisResult
+import cache
 import logging
+import math
 import os
-import json
-import re
+import orjson
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
 from dotenv import load_dotenv
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
 from sqlalchemy.exc import SQLAlchemyError
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(levelname)s:%(message)s')
-
-# Define the SQLite database filename
-db_filename = 'bottom_feeder.db'
-
-# Create the SQLite engine
-engine = create_engine(f'sqlite:///{db_filename}')
-
-# Ensure the database and tables are created
-Base.metadata.create_all(engine)
-
-# Create a configured "Session" class
-Session = sessionmaker(bind=engine)
-
-# Create a Session
-session = Session()
+# Configure logging; set LOG_LEVEL=WARNING in production to keep per-article chatter off stderr
+logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO'), format='%(levelname)s:%(message)s')
 
 # Initialize DeepSeek API
 DEEPSEEK_API_KEY = os.getenv('DEEPSEEK_API_KEY')
@@ -39,213 +32,467 @@ if not DEEPSEEK_API_KEY:
 
 # DeepSeek API endpoint
 DEEPSEEK_API_URL = "https://api.deepseek.com/v1/chat/completions"
+DEEPSEEK_MODEL = "deepseek-chat"  # Replace with the correct model name
+DEEPSEEK_TEMPERATURE = 0.3
+
+# Company and CEO names appear near the top, so only the start of each
+# article is sent to DeepSeek
+MAX_BODY_CHARS = 4000
+
+# Shared HTTP client session, opened by main() inside the running event loop
+http_session = None
+
+# Transient HTTP failures are retried with exponential backoff
+RETRY_TOTAL = 3
+RETRY_BACKOFF_FACTOR = 0.3
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
 
-def analyze_article(body_text):
+# A POST such as a billable DeepSeek call is only retried when the server
+# refused it outright, never after it may have been processed
+RETRY_POST_STATUS_CODES = {429}
+
+# Longest Retry-After we will honour; asking for more fails the request
+RETRY_MAX_DELAY = 30
+
+def _retry_after(response):
+    """
+    Return the number of seconds the server asked us to wait in its
+    Retry-After header, or None if it didn't send a usable one.
+    """
+    value = response.headers.get('Retry-After')
+    if value is None:
+        return None
+    try:
+        seconds = float(value)
+        # NaN is not a usable delay; infinity is, and is rejected as too long
+        return None if math.isnan(seconds) else max(0.0, seconds)
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+async def request_with_retry(method, url, **kwargs):
+    """
+    Send a request on the shared HTTP session, retrying transient failures
+    with exponential backoff, or after Retry-After when the server sends
+    one, unless that is longer than RETRY_MAX_DELAY, in which case the
+    error response is raised instead. GETs are retried on connection errors and on any of
+    RETRY_STATUS_CODES. Other methods are only retried when the connection
+    could not be opened or on RETRY_POST_STATUS_CODES, so a request the
+    server may have acted on is never sent twice. Returns a (body, charset)
+    tuple: the raw response body, read while the connection is still held,
+    and the charset from the Content-Type header, or None.
+    """
+    if method == "GET":
+        retry_statuses = RETRY_STATUS_CODES
+        retry_errors = (aiohttp.ClientConnectionError, asyncio.TimeoutError)
+    else:
+        retry_statuses = RETRY_POST_STATUS_CODES
+        retry_errors = (aiohttp.ClientConnectorError,)
+
+    for attempt in range(RETRY_TOTAL + 1):
+        delay = RETRY_BACKOFF_FACTOR * (2 ** attempt)
+        try:
+            async with http_session.request(method, url, **kwargs) as response:
+                if response.status not in retry_statuses or attempt == RETRY_TOTAL:
+                    response.raise_for_status()  # Check for HTTP errors
+                    return await response.read(), response.charset
+                retry_after = _retry_after(response)
+                if retry_after is not None:
+                    if retry_after > RETRY_MAX_DELAY:
+                        logging.warning("Got HTTP %s from %s asking to retry in %.0fs, giving up.", response.status, url, retry_after)
+                        response.raise_for_status()
+                    delay = retry_after
+                logging.warning("Got HTTP %s from %s, retrying in %.1fs.", response.status, url, delay)
+        except retry_errors as e:
+            if attempt == RETRY_TOTAL:
+                raise
+            logging.warning("Request to %s failed, retrying: %s", url, e)
+        await asyncio.sleep(delay)
+
+# Analyses currently being requested, by exact cache key, so concurrent
+# identical articles share a single DeepSeek call
+_in_flight = {}
+
+async def analyze_article(body_text, domain):
     """
     Analyze the article's body text using DeepSeek to extract company name,
     CEO name, and a summary. Returns a dictionary with the extracted information.
+    Identical articles are answered from the exact-match cache and
+    near-duplicates from the same domain from the semantic cache, without
+    calling DeepSeek.
     """
     try:
-        prompt = (
-            "Extract the following information from the article below:\n"
-            "- Company Name\n"
-            "- CEO Name\n"
-            "- Summary\n\n"
-            "Article:\n"
-            f"{body_text}\n\n"
-            "Please provide the information in the following JSON format exactly as shown:\n"
-            "{\n"
-            '  "company_name": "Company Name",\n'
-            '  "ceo_name": "CEO Name",\n'
-            '  "summary": "Summary of the article."\n'
-            "}\n"
-            "Ensure that all fields are filled accurately."
-        )
-        
-        # Prepare the request payload for DeepSeek
-        headers = {
-            "Authorization": f"Bearer {DEEPSEEK_API_KEY}",
-            "Content-Type": "application/json"
-        }
-        data = {
-            "model": "deepseek-chat",  # Replace with the correct model name
-            "messages": [
-                {"role": "system", "content": "You are an assistant that extracts specific information from articles."},
-                {"role": "user", "content": prompt}
-            ],
-            "temperature": 0.3,
-            "max_tokens": 300
-        }
-        
-        # Make the API request to DeepSeek
-        response = requests.post(DEEPSEEK_API_URL, headers=headers, json=data)
-        response.raise_for_status()  # Check for HTTP errors
-        
-        # Extract the assistant's reply
-        reply = response.json()["choices"][0]["message"]["content"].strip()
-        
-        # Parse the JSON response
-        json_match = re.search(r'\{.*\}', reply, re.DOTALL)
-        if not json_match:
-            logging.error("No JSON object found in DeepSeek response.")
+        body_for_llm = body_text[:MAX_BODY_CHARS]
+
+        # Identical requests are answered straight from the exact-match cache
+        key = cache.exact_key(DEEPSEEK_MODEL, DEEPSEEK_TEMPERATURE, body_for_llm)
+        cached_analysis = cache.get_exact_analysis(key)
+        if cached_analysis:
+            logging.info("Exact cache hit.")
+            return cached_analysis
+
+        # An identical article may already be being analyzed; share its result
+        in_flight = _in_flight.get(key)
+        if in_flight is not None:
+            logging.info("Waiting for in-flight analysis of an identical article.")
+            return await asyncio.shield(in_flight)
+
+        in_flight = asyncio.get_running_loop().create_future()
+        _in_flight[key] = in_flight
+        analysis = None
+        try:
+            analysis = await _request_analysis(body_for_llm, key, domain)
+            return analysis
+        finally:
+            # Waiters get None if the request failed
+            del _in_flight[key]
+            in_flight.set_result(analysis)
+
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logging.error("DeepSeek API request failed: %s", e)
+        return None
+    except orjson.JSONDecodeError as e:
+        logging.error("JSON parsing error: %s", e)
+        return None
+    except Exception as e:
+        logging.error("Unexpected error during analysis: %s", e)
+        return None
+
+async def _request_analysis(body_for_llm, key, domain):
+    """
+    Answer an exact-cache miss from the semantic cache or, failing that,
+    from DeepSeek, storing fresh results in both caches. Semantic hits are
+    not copied into the exact-match cache, which has no TTL, so a borrowed
+    analysis can't outlive its semantic entry.
+    """
+    # Reuse the analysis of a near-identical article if we have one
+    embedding = await cache.embed_text(http_session, body_for_llm)
+    if embedding is not None:
+        cached_analysis = cache.find_similar_analysis(embedding, domain)
+        if cached_analysis:
+            return cached_analysis
+
+    # JSON mode guarantees a parseable reply, so only the keys are described
+    prompt = (
+        "Extract the company name, CEO name and a short summary from the article below. "
+        'Reply with a JSON object with the keys "company_name", "ceo_name" and "summary".\n\n'
+        "Article:\n"
+        f"{body_for_llm}"
+    )
+    
+    # Prepare the request payload for DeepSeek
+    headers = {
+        "Authorization": f"Bearer {DEEPSEEK_API_KEY}",
+        "Content-Type": "application/json"
+    }
+    data = {
+        "model": DEEPSEEK_MODEL,
+        "messages": [
+            {"role": "system", "content": "You are an assistant that extracts specific information from articles."},
+            {"role": "user", "content": prompt}
+        ],
+        "temperature": DEEPSEEK_TEMPERATURE,
+        "max_tokens": 300,
+        "response_format": {"type": "json_object"}
+    }
+    
+    # Make the API request to DeepSeek
+    body, _ = await request_with_retry("POST", DEEPSEEK_API_URL, headers=headers, json=data)
+    result = orjson.loads(body)
+    
+    # Extract and parse the assistant's reply
+    reply = result["choices"][0]["message"]["content"]
+    analysis = orjson.loads(reply)
+    
+    logging.info("Analysis received: %s", analysis)
+
+    cache.store_exact_analysis(key, analysis)
+    if embedding is not None:
+        cache.store_analysis(embedding, domain, analysis)
+    
+    return analysis
+
+def _is_article_part(name, attrs):
+    """
+    Matches only the tags parse_html reads: the title, the publication
+    date and the article body, which keeps its paragraphs.
+    """
+    classes = attrs.get('class', '')
+    if not isinstance(classes, str):
+        classes = ' '.join(classes)
+    classes = set(classes.split())
+    return (
+        name == 'h1'
+        or (name == 'span' and {'d-ib', 'mr-05'} <= classes)
+        or (name == 'div' and {'kInstance-Body', 'instance-box-mb'} <= classes)
+    )
+
+# Only the matching tags are built into the tree; the rest of the page is skipped
+ARTICLE_STRAINER = SoupStrainer(_is_article_part)
+
+# Parsing is CPU-bound, so main() parses larger batches in a pool of worker
+# processes to use every core. Without it, parsing falls back to the default
+# executor.
+process_pool = None
+
+# Fewest URLs for which main() starts the process pool
+PROCESS_POOL_MIN_URLS = 8
+
+def parse_html(content, encoding=None):
+    """
+    Parses an article page and extracts its title, publication date and
+    body text. Returns a dictionary of those Article column values, or None
+    if any of them could not be found. The raw bytes are handed to lxml,
+    decoded with the charset from the HTTP headers when the server sent one.
+    """
+    soup = BeautifulSoup(content, 'lxml', parse_only=ARTICLE_STRAINER, from_encoding=encoding)
+
+    # Extract the article title
+    try:
+        title_tag = soup.select_one('h1')
+        if title_tag:
+            title = title_tag.get_text(strip=True)
+            logging.info("Title found: %s", title)
+        else:
+            logging.error("Title tag <h1> not found.")
             return None
-        
-        json_str = json_match.group()
-        analysis = json.loads(json_str)
-        
-        logging.info(f"Analysis received: {analysis}")
-        
-        return analysis
-
-    except requests.exceptions.RequestException as e:
-        logging.error(f"DeepSeek API request failed: {e}")
+    except Exception as e:
+        logging.error("Error extracting title: %s", e)
         return None
-    except json.JSONDecodeError as e:
-        logging.error(f"JSON parsing error: {e}")
+
+    # Extract the publication date with updated selector
+    try:
+        pub_date_tag = soup.select_one('span.d-ib.mr-05')
+        if pub_date_tag:
+            pub_date = pub_date_tag.get_text(strip=True)
+            logging.info("Publication Date found: %s", pub_date)
+        else:
+            logging.error("Publication date tag <span class='d-ib mr-05'> not found.")
+            return None
+    except Exception as e:
+        logging.error("Error extracting publication date: %s", e)
         return None
+
+    # Extract the article body (adjusted selector)
+    try:
+        body_div = soup.select_one('div.kInstance-Body.instance-box-mb')
+        if body_div:
+            paragraphs = body_div.find_all('p')
+            if paragraphs:
+                body_text = '\n\n'.join([para.get_text(strip=True) for para in paragraphs])
+                logging.info("Article body extracted successfully.")
+            else:
+                logging.error("No <p> tags found within the article body.")
+                return None
+        else:
+            logging.error("Article body div <div class='kInstance-Body instance-box-mb'> not found.")
+            return None
     except Exception as e:
-        logging.error(f"Unexpected error during analysis: {e}")
+        logging.error("Error extracting article body: %s", e)
         return None
 
-def fetch_and_store_article(url):
+    return {
+        "title": title,
+        "publication_date": pub_date,
+        "body_text": body_text
+    }
+
+async def fetch_article(url):
     """
-    Fetches an article from the given URL, extracts relevant information,
-    analyzes the content using DeepSeek, and stores both the article
-    and its analysis in the SQLite database.
+    Fetches an article from the given URL and extracts its contents.
+    Returns a dictionary of Article column values, or None on failure.
     """
     try:
-        logging.info(f"Fetching URL: {url}")
+        logging.info("Fetching URL: %s", url)
         # Make an HTTP GET request to fetch the article
-        response = requests.get(url)
-        response.raise_for_status()  # Check for HTTP errors
+        content, charset = await request_with_retry("GET", url)
 
-        soup = BeautifulSoup(response.text, 'html.parser')
+        # Parse in a worker process so other fetches keep making progress
+        loop = asyncio.get_running_loop()
+        parsed = await loop.run_in_executor(process_pool, parse_html, content, charset)
+        if parsed is None:
+            return None
 
-        # Extract the article title
-        try:
-            title_tag = soup.find('h1')
-            if title_tag:
-                title = title_tag.get_text(strip=True)
-                logging.info(f"Title found: {title}")
-            else:
-                logging.error("Title tag <h1> not found.")
-                return
-        except Exception as e:
-            logging.error(f"Error extracting title: {e}")
+        return {"url": url, **parsed}
+
+    except aiohttp.ClientResponseError as http_err:
+        logging.error("HTTP error occurred: %s", http_err)  # e.g., 404 Not Found
+    except Exception as err:
+        logging.error("An unexpected error occurred: %s", err)
+    return None
+
+async def fetch_and_store_article(url):
+    """
+    Fetches an article from the given URL, extracts relevant information,
+    analyzes the content using DeepSeek, and stores both the article
+    and its analysis in the SQLite database.
+    """
+    try:
+        row = await fetch_article(url)
+        if row is None:
             return
+        title, body_text = row["title"], row["body_text"]
 
-        # Extract the publication date with updated selector
+        # Insert the article unless its URL is already stored. RETURNING only
+        # yields an ID for a new row, so one atomic statement both checks and
+        # inserts, with no race between concurrent scrapers.
         try:
-            pub_date_tag = soup.find('span', class_='d-ib mr-05')
-            if pub_date_tag:
-                pub_date = pub_date_tag.get_text(strip=True)
-                logging.info(f"Publication Date found: {pub_date}")
+            with WriteSession.begin() as session:
+                article_id = session.execute(
+                    insert(Article).values(**row).on_conflict_do_nothing(index_elements=['url']).returning(Article.id)
+                ).scalar()
+            if article_id is not None:
+                logging.info("Scraped and saved article: %s", title)
             else:
-                logging.error("Publication date tag <span class='d-ib mr-05'> not found.")
-                return
-        except Exception as e:
-            logging.error(f"Error extracting publication date: {e}")
+                logging.info("Article already exists in the database: %s", title)
+                # Check if analysis already exists
+                with ReadSession.begin() as session:
+                    article_id, analysis_id = session.execute(
+                        select(Article.id, AnalysisResult.id).outerjoin(AnalysisResult).where(Article.url == url)
+                    ).one()
+                if analysis_id is not None:
+                    logging.info("Analysis already exists for article ID %s. Skipping analysis.", article_id)
+                    return article_id
+                logging.info("No analysis found for article ID %s. Performing analysis.", article_id)
+        except SQLAlchemyError as e:
+            logging.error("Database error: %s", e)
             return
 
-        # Extract the article body (adjusted selector)
+        # Analyze the article using DeepSeek
+        analysis = await analyze_article(body_text, urlparse(url).netloc)
+        if not analysis:
+            logging.error("Failed to analyze the article.")
+            return article_id
+
         try:
-            body_div = soup.find('div', class_='kInstance-Body instance-box-mb')
-            if body_div:
-                paragraphs = body_div.find_all('p')
-                if paragraphs:
-                    body_text = '\n\n'.join([para.get_text(strip=True) for para in paragraphs])
-                    logging.info("Article body extracted successfully.")
-                else:
-                    logging.error("No <p> tags found within the article body.")
-                    return
+            with WriteSession.begin() as session:
+                result = session.execute(
+                    insert(AnalysisResult).values(
+                        article_id=article_id,
+                        company_name=analysis.get("company_name", ""),
+                        ceo_name=analysis.get("ceo_name", ""),
+                        summary=analysis.get("summary", "")
+                    ).on_conflict_do_nothing(index_elements=['article_id'])
+                )
+            if result.rowcount:
+                logging.info("Analysis saved for article ID %s", article_id)
             else:
-                logging.error("Article body div <div class='kInstance-Body instance-box-mb'> not found.")
-                return
-        except Exception as e:
-            logging.error(f"Error extracting article body: {e}")
-            return
+                logging.info("Analysis already exists for article ID %s.", article_id)
+        except SQLAlchemyError as e:
+            logging.error("Database error: %s", e)
 
-        # Check if the article already exists
-        try:
-            existing_article = session.query(Article).filter_by(url=url).first()
-            if existing_article:
-                logging.info(f"Article already exists in the database: {title}")
-                # Check if analysis already exists
-                existing_analysis = session.query(AnalysisResult).filter_by(article_id=existing_article.id).first()
-                if existing_analysis:
-                    logging.info(f"Analysis already exists for article ID {existing_article.id}. Skipping analysis.")
-                else:
-                    logging.info(f"No analysis found for article ID {existing_article.id}. Performing analysis.")
-                    analysis = analyze_article(body_text)
-                    if analysis:
-                        # Create a new AnalysisResult object
-                        analysis_result = AnalysisResult(
-                            article_id=existing_article.id,
-                            company_name=analysis.get("company_name", ""),
-                            ceo_name=analysis.get("ceo_name", ""),
-                            summary=analysis.get("summary", "")
-                        )
-
-                        # Add to session and commit
-                        session.add(analysis_result)
-                        session.commit()
-
-                        logging.info(f"Analysis saved for article ID {existing_article.id}")
-                    else:
-                        logging.error("Failed to analyze the article.")
-                return existing_article.id
-        except Exception as e:
-            logging.error(f"Error querying the database: {e}")
-            return
+        return article_id
 
-        # Create a new Article object
+    except Exception as err:
+        logging.error("An unexpected error occurred: %s", err)
+
+async def fetch_and_store_articles(urls):
+    """
+    Batch version of fetch_and_store_article. Fetches all URLs concurrently,
+    stores the new articles with a single INSERT, then analyzes every
+    article still missing an analysis and stores those with a second one.
+    Returns a dictionary mapping each stored URL to its article ID.
+    """
+    rows = [row for row in await asyncio.gather(*(fetch_article(url) for url in dict.fromkeys(urls))) if row]
+    if not rows:
+        return {}
+
+    try:
+        # Insert all new articles at once; RETURNING gives their IDs directly
+        with WriteSession.begin() as session:
+            inserted = session.execute(
+                insert(Article).values(rows).on_conflict_do_nothing(index_elements=['url']).returning(Article.url, Article.id)
+            ).all()
+        article_ids = dict(inserted)
+        needs_analysis = set(article_ids)
+        logging.info("Scraped and saved %s new articles.", len(inserted))
+
+        # Articles stored by an earlier run may still be missing an analysis
+        existing_urls = [row["url"] for row in rows if row["url"] not in article_ids]
+        if existing_urls:
+            with ReadSession.begin() as session:
+                existing = session.execute(
+                    select(Article.url, Article.id, AnalysisResult.id)
+                    .outerjoin(AnalysisResult)
+                    .where(Article.url.in_(existing_urls))
+                ).all()
+            for url, article_id, analysis_id in existing:
+                article_ids[url] = article_id
+                if analysis_id is None:
+                    needs_analysis.add(url)
+    except SQLAlchemyError as e:
+        logging.error("Database error: %s", e)
+        return {}
+
+    # Analyze the articles using DeepSeek
+    to_analyze = [row for row in rows if row["url"] in needs_analysis]
+    analyses = await asyncio.gather(
+        *(analyze_article(row["body_text"], urlparse(row["url"]).netloc) for row in to_analyze)
+    )
+    analysis_rows = []
+    for row, analysis in zip(to_analyze, analyses):
+        if not analysis:
+            logging.error("Failed to analyze the article: %s", row['url'])
+            continue
+        analysis_rows.append({
+            "article_id": article_ids[row["url"]],
+            "company_name": analysis.get("company_name", ""),
+            "ceo_name": analysis.get("ceo_name", ""),
+            "summary": analysis.get("summary", "")
+        })
+
+    if analysis_rows:
         try:
-            article = Article(
-                url=url,
-                title=title,
-                publication_date=pub_date,
-                body_text=body_text
-            )
-
-            # Add to session and commit
-            session.add(article)
-            session.commit()
-
-            logging.info(f"Scraped and saved article: {title}")
-
-            # Analyze the article using DeepSeek
-            analysis = analyze_article(body_text)
-            if analysis:
-                # Create a new AnalysisResult object
-                analysis_result = AnalysisResult(
-                    article_id=article.id,
-                    company_name=analysis.get("company_name", ""),
-                    ceo_name=analysis.get("ceo_name", ""),
-                    summary=analysis.get("summary", "")
+            with WriteSession.begin() as session:
+                session.execute(
+                    insert(AnalysisResult).on_conflict_do_nothing(index_elements=['article_id']),
+                    analysis_rows
                 )
+            logging.info("Analysis saved for %s articles.", len(analysis_rows))
+        except SQLAlchemyError as e:
+            logging.error("Database error: %s", e)
 
-                # Add to session and commit
-                session.add(analysis_result)
-                session.commit()
+    return article_ids
 
-                logging.info(f"Analysis saved for article ID {article.id}")
-            else:
-                logging.error("Failed to analyze the article.")
+async def main(article_urls):
+    """
+    Scrapes and analyzes all of the given URLs concurrently.
+    """
+    global http_session, process_pool
+    # Ensure the database and tables are created
+    ensure_schema()
 
-            return article.id
-        except SQLAlchemyError as e:
-            logging.error(f"Database error: {e}")
-            session.rollback()
-            return
-        except Exception as e:
-            logging.error(f"Error saving article or analysis: {e}")
-            session.rollback()
-            return
+    # Starting worker processes costs more than parsing a few pages on a
+    # thread, so small batches stay in the default executor
+    if len(article_urls) >= PROCESS_POOL_MIN_URLS:
+        # Workers come from a forkserver rather than forking this process, which
+        # by now holds SQLite connections and aiohttp's resolver threads.
+        # Platforms without forkserver (Windows) spawn them instead.
+        start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        process_pool = ProcessPoolExecutor(
+            max_workers=min(os.cpu_count() or 1, len(article_urls)),
+            mp_context=multiprocessing.get_context(start_method)
+        )
 
-    except requests.exceptions.HTTPError as http_err:
-        logging.error(f"HTTP error occurred: {http_err}")  # e.g., 404 Not Found
-    except Exception as err:
-        logging.error(f"An unexpected error occurred: {err}")
+    # Keep connections alive so repeat calls to the same host skip the TLS handshake
+    connector = aiohttp.TCPConnector(limit=50, limit_per_host=20, keepalive_timeout=60)
+    try:
+        async with aiohttp.ClientSession(connector=connector) as http_session:
+            article_ids = await fetch_and_store_articles(article_urls)
+    finally:
+        if process_pool is not None:
+            process_pool.shutdown()
+            process_pool = None
+
+    for url in article_urls:
+        article_id = article_ids.get(url)
+        if article_id:
+            print(f"Article ID {article_id} saved.")
+        else:
+            print(f"Failed to save article from URL: {url}")
 
 if __name__ == "__main__":
     # List of article URLs to scrape
@@ -255,9 +502,4 @@ if __name__ == "__main__":
         # Add more URLs here
     ]
 
-    for url in article_urls:
-        article_id = fetch_and_store_article(url)
-        if article_id:
-            print(f"Article ID {article_id} saved.")
-        else:
-            print(f"Failed to save article from URL: {url}")
\ No newline at end of file
+    asyncio.run(main(article_urls))